@@ -5,10 +5,15 @@
 # See documentation in:
 # http://doc.scrapy.org/en/latest/topics/items.html
 import re
-import json
 import datetime
 from typing import Any, Dict
 
+try:
+    # orjson is optional; it decodes the large __NEXT_DATA__ blobs noticeably faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 import scrapy
 from scrapy import Field
 from scrapy.loader import ItemLoader
@@ -98,8 +103,10 @@ def visit_path(data: Dict[str, Any], key: str, original_key: str):
 
 
 def json_field_extractor_v2(key: str):
-    def extract_field(text: str):
-        data = json.loads(text)
+    def extract_field(text_or_data):
+        # Spiders parse __NEXT_DATA__ once per page and pass the decoded dict,
+        # raw JSON strings are still accepted
+        data = json_loads(text_or_data) if isinstance(text_or_data, (str, bytes)) else text_or_data
         return list(visit_path(data, key, key))
     return extract_field
 
@@ -199,6 +206,8 @@ class AuthorItem(scrapy.Item):
 
 class SearchResultItem(scrapy.Item):
     row_idx = Field()
+    # Other rows with the same title/author; checkpointed with row_idx, not written
+    duplicate_row_idxs = Field()
     title = Field()
     author = Field()
     description = Field()
@@ -57,22 +57,55 @@ class GoodreadsscraperSpiderMiddleware(object):
 
 import os
 import re
+import gzip
+import time
+import random
 import hashlib
-from datetime import datetime
+import logging
+from functools import lru_cache
+
+from twisted.internet.threads import deferToThread
+
+
+@lru_cache(maxsize=4096)
+def _url_hash(url):
+    # Retries and redirects revisit the same URL, so memoize the filename hash
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=5).hexdigest()
+
+
+_ts_cache = [None, ""]
+
+
+def _dump_timestamp():
+    # The dump timestamp has 1s resolution; only re-format it when the second changes
+    now = int(time.time())
+    if _ts_cache[0] != now:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime("%Y%m%d_%H%M%S", time.gmtime(now))
+    return _ts_cache[1]
 
 
 class ResponseDebugMiddleware:
-    """Logs request/response details and saves HTML to disk.
+    """Logs request/response details and saves gzipped HTML to disk.
 
     Only active when DEBUG_ENABLED=True in Scrapy settings.
     In quiet mode the middleware is still registered but becomes a pass-through.
+    Request/response logging is skipped when the spider logger is above DEBUG;
+    HTML dumps are controlled separately by DEBUG_DUMP_HTML. Non-200 responses
+    are always dumped; only a DEBUG_SAMPLE_RATE fraction of 200s are, and none
+    at all with DEBUG_DUMP_ONLY_ERRORS=True.
     """
 
-    def __init__(self, enabled=True, dump_dir="debug_responses", max_snippet=500):
+    _WS_RE = re.compile(r"\s+")
+
+    def __init__(self, enabled=True, dump_dir="debug_responses", max_snippet=500, dump_html=True,
+                 sample_rate=1.0, dump_only_errors=False):
         self.enabled = enabled
         self.dump_dir = dump_dir
         self.max_snippet = max_snippet
-        if enabled:
+        self.dump_html = dump_html
+        self.sample_rate = 0.0 if dump_only_errors else sample_rate
+        if enabled and dump_html:
             os.makedirs(self.dump_dir, exist_ok=True)
 
     @classmethod
@@ -80,10 +113,14 @@ class ResponseDebugMiddleware:
         enabled = crawler.settings.getbool("DEBUG_ENABLED", True)
         dump_dir = crawler.settings.get("DEBUG_DUMP_DIR", "debug_responses")
         max_snippet = crawler.settings.getint("DEBUG_MAX_SNIPPET", 500)
-        return cls(enabled=enabled, dump_dir=dump_dir, max_snippet=max_snippet)
+        dump_html = crawler.settings.getbool("DEBUG_DUMP_HTML", True)
+        sample_rate = crawler.settings.getfloat("DEBUG_SAMPLE_RATE", 1.0)
+        dump_only_errors = crawler.settings.getbool("DEBUG_DUMP_ONLY_ERRORS", False)
+        return cls(enabled=enabled, dump_dir=dump_dir, max_snippet=max_snippet, dump_html=dump_html,
+                   sample_rate=sample_rate, dump_only_errors=dump_only_errors)
 
     def process_request(self, request, spider):
-        if self.enabled:
+        if self.enabled and spider.logger.isEnabledFor(logging.DEBUG):
             spider.logger.debug(f"[REQ] {request.method} {request.url} meta={dict(request.meta)}")
         return None
 
@@ -92,27 +129,58 @@ class ResponseDebugMiddleware:
             return response
 
         ct = response.headers.get(b"Content-Type", b"").decode(errors="ignore")
-        body_len = len(response.body or b"")
-        spider.logger.debug(
-            f"[RESP] {response.status} {request.url} "
-            f"len={body_len} content-type={ct}"
-        )
 
-        try:
-            txt = response.text
-        except Exception:
-            txt = (response.body or b"").decode("utf-8", errors="ignore")
-
-        snippet = re.sub(r"\s+", " ", txt)[: self.max_snippet]
-        spider.logger.debug(f"[RESP-SNIP] {response.status} {request.url} :: {snippet}")
-
-        # Save every HTML response to disk for inspection
-        if "text/html" in ct:
-            h = hashlib.md5(request.url.encode("utf-8")).hexdigest()[:10]
-            ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            fname = os.path.join(self.dump_dir, f"{ts}_{response.status}_{h}.html")
-            with open(fname, "wb") as f:
-                f.write(response.body or b"")
-            spider.logger.warning(f"[DUMP] Saved response to {fname}")
+        # Decoding the body is wasted work if the debug lines would be dropped anyway
+        if spider.logger.isEnabledFor(logging.DEBUG):
+            body_len = len(response.body or b"")
+            spider.logger.debug(
+                f"[RESP] {response.status} {request.url} "
+                f"len={body_len} content-type={ct}"
+            )
+
+            try:
+                txt = response.text
+            except Exception:
+                txt = (response.body or b"").decode("utf-8", errors="ignore")
+
+            # Only a prefix is kept, so don't collapse whitespace over the whole body;
+            # 4x leaves room for runs of whitespace that shrink to a single space
+            snippet = self._WS_RE.sub(" ", txt[: self.max_snippet * 4])[: self.max_snippet]
+            spider.logger.debug(f"[RESP-SNIP] {response.status} {request.url} :: {snippet}")
+
+        # Save HTML responses to disk for inspection: every error, but only a sample of
+        # successful pages so large runs don't create one file per book
+        if self.dump_html and "text/html" in ct and self._should_dump(response):
+            h = _url_hash(request.url)
+            ts = _dump_timestamp()
+            fname = os.path.join(self.dump_dir, f"{ts}_{response.status}_{h}.html.gz")
+            # Write from the reactor's thread pool so disk I/O doesn't stall downloads.
+            # deferToThread looks the reactor up at call time, so importing this module
+            # doesn't install the default reactor ahead of TWISTED_REACTOR
+            d = deferToThread(self._write_dump, fname, response.body or b"", spider.logger)
+            d.addErrback(lambda f: spider.logger.warning(f"[DUMP] Failed to write {fname}: {f.value}"))
 
         return response
+
+    def _should_dump(self, response):
+        if response.status != 200:
+            return True
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    @staticmethod
+    def _write_dump(fname, body, logger):
+        # HTML compresses several-fold even at level 1, which is cheap enough to
+        # keep up with the crawl; open dumps with `zcat` or `gzip.open`
+        body = gzip.compress(body, compresslevel=1)
+        # Raw fd writes skip Python's buffering layer, which would only add a copy
+        # for a body that's already a single bytes object
+        fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if body and hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, len(body))
+            view = memoryview(body)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        logger.warning(f"[DUMP] Saved response to {fname}")
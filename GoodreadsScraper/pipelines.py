@@ -4,6 +4,7 @@
 #
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: http://doc.scrapy.org/en/latest/topics/item-pipeline.html
+import array
 import csv
 import logging
 import os
@@ -20,29 +21,39 @@ class CsvSearchResultPipeline:
     """Writes SearchResultItem rows to a per-worker CSV file with checkpointing."""
 
     CSV_COLUMNS = ["title", "author", "genres", "description", "publishedYear", "goodreads_url", "status"]
+    FLUSH_EVERY = 500
+    CHECKPOINT_EVERY = 1000
 
     @classmethod
     def from_crawler(cls, crawler):
         output_file = crawler.settings.get("SEARCH_OUTPUT_FILE", "search_results.csv")
         checkpoint_file = crawler.settings.get("SEARCH_CHECKPOINT_FILE", "checkpoint.txt")
-        return cls(output_file, checkpoint_file)
+        write_batch = crawler.settings.getint("SEARCH_WRITE_BATCH", cls.FLUSH_EVERY)
+        return cls(output_file, checkpoint_file, write_batch)
 
-    def __init__(self, output_file, checkpoint_file):
+    def __init__(self, output_file, checkpoint_file, write_batch=FLUSH_EVERY):
         self.output_file = output_file
         self.checkpoint_file = checkpoint_file
+        self.write_batch = write_batch
         self.items_since_checkpoint = 0
-        self.completed_indices = []
+        # Row indices are staged in a compact unsigned array; the on-disk checkpoint
+        # stays one ASCII index per line since that's what resume reads back
+        self.completed_indices = array.array("Q")
+        self._row_buffer = []
 
     def open_spider(self, spider):
         file_exists = os.path.exists(self.output_file)
-        self.file = open(self.output_file, "a", newline="", encoding="utf-8")
-        self.writer = csv.DictWriter(self.file, fieldnames=self.CSV_COLUMNS)
+        self.file = open(self.output_file, "a", newline="", encoding="utf-8", buffering=1 << 20)
+        self.writer = csv.writer(self.file)
         if not file_exists:
-            self.writer.writeheader()
+            self.writer.writerow(self.CSV_COLUMNS)
+        self._ckpt_file = open(self.checkpoint_file, "a", buffering=1 << 16)
         logger.info("[CSV-PIPELINE] Opened output file: %s (exists_before_open=%s)", self.output_file, file_exists)
 
     def close_spider(self, spider):
+        self._flush_rows()
         self._save_checkpoint()
+        self._ckpt_file.close()
         self.file.close()
 
     def process_item(self, item, spider):
@@ -51,25 +62,40 @@ class CsvSearchResultPipeline:
             return item
 
         logger.info("[CSV-PIPELINE] Writing SearchResultItem: title=%r status=%r", item.get("title"), item.get("status"))
-        row = {col: item.get(col, "") for col in self.CSV_COLUMNS}
-        self.writer.writerow(row)
-        self.file.flush()
+        self._row_buffer.append([item.get(col, "") for col in self.CSV_COLUMNS])
 
         self.completed_indices.append(item["row_idx"])
+        duplicates = item.get("duplicate_row_idxs")
+        if duplicates:
+            self.completed_indices.extend(duplicates)
         self.items_since_checkpoint += 1
-        if self.items_since_checkpoint >= 1000:
+        # Live progress for search_crawl.py; checkpoints stay the durable record
+        counter = getattr(spider, "progress_counter", None)
+        if counter is not None:
+            counter.value += 1
+        if self.items_since_checkpoint >= self.CHECKPOINT_EVERY:
+            # Rows must hit the disk before their indices are checkpointed
+            self._flush_rows()
             self._save_checkpoint()
             self.items_since_checkpoint = 0
+        elif len(self._row_buffer) >= self.write_batch:
+            self._flush_rows()
 
         return item
 
+    def _flush_rows(self):
+        if not self._row_buffer:
+            return
+        self.writer.writerows(self._row_buffer)
+        self.file.flush()
+        self._row_buffer.clear()
+
     def _save_checkpoint(self):
         if not self.completed_indices:
             return
-        with open(self.checkpoint_file, "a") as f:
-            for idx in self.completed_indices:
-                f.write(f"{idx}\n")
-        self.completed_indices = []
+        self._ckpt_file.write("".join(f"{idx}\n" for idx in self.completed_indices))
+        self._ckpt_file.flush()
+        del self.completed_indices[:]
 
 
 class JsonLineItemSegregator(object):
@@ -0,0 +1,15 @@
+"""Goodreads search URLs.
+
+Kept free of Scrapy imports so search_crawl.py can build URLs in its parent
+process without pulling in Scrapy and Twisted.
+"""
+
+import urllib.parse
+
+SEARCH_URL = "https://www.goodreads.com/search?q="
+
+
+def build_search_url(title, author=None):
+    """Return the Goodreads search URL for a title and optional author."""
+    query = f"{title} {author}" if author else title
+    return SEARCH_URL + urllib.parse.quote_plus(query)
@@ -29,9 +29,18 @@ ROBOTSTXT_OBEY = True
 # See also autothrottle settings and docs
 DOWNLOAD_DELAY = 0.1
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+CONCURRENT_REQUESTS_PER_DOMAIN = 16
 #CONCURRENT_REQUESTS_PER_IP = 16
 
+# Run Scrapy on the asyncio reactor
+TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+
+# Multiplex requests to goodreads.com over a single HTTP/2 connection
+# This needs the h2 package (pip install "Twisted[http2]")
+#DOWNLOAD_HANDLERS = {
+#    'https': 'scrapy.core.downloader.handlers.http2.H2DownloadHandler',
+#}
+
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
 
@@ -4,10 +4,27 @@ import logging
 import scrapy
 
 from .author_spider import AuthorSpider
-from ..items import BookItem, BookLoader, DEBUG
+from ..items import BookItem, BookLoader, DEBUG, json_loads
 
 logger = logging.getLogger(__name__)
 
+# XPath equivalent of the CSS selector 'script#__NEXT_DATA__::text',
+# used directly so the CSS-to-XPath translation is skipped on every page
+NEXT_DATA_XPATH = "descendant-or-self::script[@id = '__NEXT_DATA__']/text()"
+
+# XPath equivalent of 'a[href*="/book/show/"]::attr(href)', for pages linking to books
+BOOK_LINK_XPATH = "descendant-or-self::a[contains(@href, '/book/show/')]/@href"
+
+# BookItem fields that are extracted from the __NEXT_DATA__ JSON
+NEXT_DATA_FIELDS = (
+    'title', 'titleComplete', 'description', 'imageUrl', 'genres',
+    'asin', 'isbn', 'isbn13', 'publisher', 'series', 'author',
+    'publishDate', 'publishedYear',
+    'characters', 'places', 'ratingHistogram', 'ratingsCount', 'reviewsCount',
+    'numPages', 'format',
+    'language', 'awards',
+)
+
 class BookSpider(scrapy.Spider):
     """Extract information from a /book/show type page on Goodreads
 
@@ -27,47 +44,29 @@ class BookSpider(scrapy.Spider):
     def parse(self, response, loader=None):
         logger.debug("[BOOK] Parsing %s — status=%s", response.request.url, response.status)
 
-        next_data_raw = response.css('script#__NEXT_DATA__::text').get()
+        next_data_raw = response.xpath(NEXT_DATA_XPATH).get()
         if next_data_raw:
             logger.info("[BOOK] __NEXT_DATA__ found (%d chars) on %s", len(next_data_raw), response.request.url)
             logger.debug("[BOOK] __NEXT_DATA__ snippet: %.300s", next_data_raw)
         else:
             logger.warning("[BOOK] __NEXT_DATA__ NOT FOUND on %s — extraction will yield no fields", response.request.url)
 
+        # Decode the JSON once; every field's processor walks the same dict
+        next_data = json_loads(next_data_raw) if next_data_raw else None
+
         if not loader:
             loader = BookLoader(BookItem(), response=response)
 
         loader.add_value('url', response.request.url)
 
         # The new Goodreads page sends JSON in a script tag
-        # that has these values
-
-        loader.add_css('title', 'script#__NEXT_DATA__::text')
-        loader.add_css('titleComplete', 'script#__NEXT_DATA__::text')
-        loader.add_css('description', 'script#__NEXT_DATA__::text')
-        loader.add_css('imageUrl', 'script#__NEXT_DATA__::text')
-        loader.add_css('genres', 'script#__NEXT_DATA__::text')
-        loader.add_css('asin', 'script#__NEXT_DATA__::text')
-        loader.add_css('isbn', 'script#__NEXT_DATA__::text')
-        loader.add_css('isbn13', 'script#__NEXT_DATA__::text')
-        loader.add_css('publisher', 'script#__NEXT_DATA__::text')
-        loader.add_css('series', 'script#__NEXT_DATA__::text')
-        loader.add_css('author', 'script#__NEXT_DATA__::text')
-        loader.add_css('publishDate', 'script#__NEXT_DATA__::text')
-        loader.add_css('publishedYear', 'script#__NEXT_DATA__::text')
-
-        loader.add_css('characters', 'script#__NEXT_DATA__::text')
-        loader.add_css('places', 'script#__NEXT_DATA__::text')
-        loader.add_css('ratingHistogram', 'script#__NEXT_DATA__::text')
-        loader.add_css("ratingsCount", 'script#__NEXT_DATA__::text')
-        loader.add_css("reviewsCount", 'script#__NEXT_DATA__::text')
-        loader.add_css('numPages', 'script#__NEXT_DATA__::text')
-        loader.add_css("format", 'script#__NEXT_DATA__::text')
-
-        loader.add_css('language', 'script#__NEXT_DATA__::text')
-        loader.add_css("awards", 'script#__NEXT_DATA__::text')
+        # that has these values; it is extracted and decoded once above
+        # and handed to every field instead of re-running the selector
+        for field in NEXT_DATA_FIELDS:
+            loader.add_value(field, next_data)
 
         item = loader.load_item()
+        url = response.request.url
 
         if DEBUG:
             all_fields = list(BookItem.fields.keys())
@@ -75,17 +74,24 @@ class BookSpider(scrapy.Spider):
             missing = [f for f in all_fields if f not in item or not item[f]]
             logger.info(
                 "Book %s — found: [%s] | missing: [%s]",
-                response.request.url,
+                url,
                 ", ".join(found),
                 ", ".join(missing),
             )
 
-        logger.info("[BOOK] Yielding BookItem for %s with fields: %s", response.request.url, list(item.keys()))
+        author_url = response.css('a.ContributorLink::attr(href)').extract_first()
+        author_request = response.follow(author_url, callback=self.author_spider.parse) if author_url else None
+
+        # Drop the raw and decoded __NEXT_DATA__ before yielding; this generator frame
+        # would otherwise keep them alive while the item goes through the pipelines.
+        # The response itself stays referenced by Scrapy until the callback finishes
+        del next_data_raw, next_data
+
+        logger.info("[BOOK] Yielding BookItem for %s with fields: %s", url, list(item.keys()))
         yield item
 
-        author_url = response.css('a.ContributorLink::attr(href)').extract_first()
-        if author_url:
+        if author_request is not None:
             logger.debug("[BOOK] Following author URL: %s", author_url)
-            yield response.follow(author_url, callback=self.author_spider.parse)
+            yield author_request
         else:
-            logger.warning("[BOOK] No author URL found on %s", response.request.url)
+            logger.warning("[BOOK] No author URL found on %s", url)
@@ -3,7 +3,7 @@
 import logging
 import scrapy
 from scrapy import signals
-from .book_spider import BookSpider
+from .book_spider import BookSpider, BOOK_LINK_XPATH
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +33,9 @@ class ListSpider(scrapy.Spider):
 
     def parse(self, response):
         logger.debug("[LIST] Parsing page %s — status=%s len=%d", response.url, response.status, len(response.body))
-        book_urls = response.css('a[href*="/book/show/"]::attr(href)').extract()
+        # Cover and title both link to the same book, so dedupe (keeping page order)
+        # before handing requests to the scheduler
+        book_urls = list(dict.fromkeys(response.xpath(BOOK_LINK_XPATH).getall()))
         logger.info("[LIST] Found %d book URLs on %s", len(book_urls), response.url)
 
         for book_url in book_urls:
@@ -1,19 +1,27 @@
 """Spider to search Goodreads for books and extract description + genres."""
 
 import logging
-import urllib.parse
 
 import scrapy
 
 logger = logging.getLogger(__name__)
 
-from ..items import BookItem, BookLoader, SearchResultItem
+from ..items import BookItem, BookLoader, SearchResultItem, json_loads
+from ..search_urls import build_search_url
+from .book_spider import BOOK_LINK_XPATH, NEXT_DATA_XPATH
 
 
 class SearchSpider(scrapy.Spider):
     """Search Goodreads for books by title/author, then extract description and genres.
 
-    Accepts a list of (row_idx, title, author_or_None) tuples via the `books` argument.
+    Arguments:
+      books: list of (row_idx, title, author_or_None) tuples, optionally extended
+        with a pre-built search_url and then duplicate_row_idxs. A missing search
+        URL is built here; duplicate_row_idxs are passed through on the result
+        item so those rows get checkpointed too.
+      progress_counter: optional shared multiprocessing.Value that
+        CsvSearchResultPipeline increments for every result it writes.
+
     For each book:
       1. Searches Goodreads: /search?q={title}+{author}
       2. Follows the first book result link
@@ -23,34 +31,36 @@ class SearchSpider(scrapy.Spider):
 
     name = "search"
 
-    def __init__(self, books=None, *args, **kwargs):
+    def __init__(self, books=None, progress_counter=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.books = books or []
+        self.progress_counter = progress_counter
 
     def start_requests(self):
-        for row_idx, title, author in self.books:
-            if author:
-                query = f"{title} {author}"
-            else:
-                query = title
-            search_url = (
-                "https://www.goodreads.com/search?q="
-                + urllib.parse.quote_plus(query)
-            )
+        for book in self.books:
+            row_idx, title, author = book[:3]
+            search_url = book[3] if len(book) > 3 else build_search_url(title, author)
+            duplicate_row_idxs = book[4] if len(book) > 4 else ()
             yield scrapy.Request(
                 search_url,
                 callback=self.parse_search,
-                cb_kwargs={"row_idx": row_idx, "title": title, "author": author},
+                cb_kwargs={
+                    "row_idx": row_idx,
+                    "title": title,
+                    "author": author,
+                    "duplicate_row_idxs": duplicate_row_idxs,
+                },
                 dont_filter=True,
             )
 
-    def parse_search(self, response, row_idx, title, author):
+    def parse_search(self, response, row_idx, title, author, duplicate_row_idxs=()):
         logger.debug("[SEARCH] Search results page %s — status=%s len=%d", response.url, response.status, len(response.body))
-        book_link = response.css('a[href*="/book/show/"]::attr(href)').get()
+        book_link = response.xpath(BOOK_LINK_XPATH).get()
         if not book_link:
             logger.warning("[SEARCH] No book link found for '%s' by '%s' on %s", title, author, response.url)
             yield SearchResultItem(
                 row_idx=row_idx,
+                duplicate_row_idxs=duplicate_row_idxs,
                 title=title,
                 author=author or "",
                 description="",
@@ -65,24 +75,37 @@ class SearchSpider(scrapy.Spider):
         yield scrapy.Request(
             book_url,
             callback=self.parse_book,
-            cb_kwargs={"row_idx": row_idx, "title": title, "author": author},
+            cb_kwargs={
+                "row_idx": row_idx,
+                "title": title,
+                "author": author,
+                "duplicate_row_idxs": duplicate_row_idxs,
+            },
             dont_filter=True,
         )
 
-    def parse_book(self, response, row_idx, title, author):
+    def parse_book(self, response, row_idx, title, author, duplicate_row_idxs=()):
         logger.debug("[SEARCH] Book page %s — status=%s len=%d", response.url, response.status, len(response.body))
 
-        next_data_raw = response.css('script#__NEXT_DATA__::text').get()
+        next_data_raw = response.xpath(NEXT_DATA_XPATH).get()
         if next_data_raw:
             logger.info("[SEARCH] __NEXT_DATA__ found (%d chars) on %s", len(next_data_raw), response.url)
         else:
             logger.warning("[SEARCH] __NEXT_DATA__ NOT FOUND on %s — fields will be empty", response.url)
 
-        loader = BookLoader(BookItem(), response=response)
-        loader.add_css("description", "script#__NEXT_DATA__::text")
-        loader.add_css("genres", "script#__NEXT_DATA__::text")
-        loader.add_css("publishedYear", "script#__NEXT_DATA__::text")
+        next_data = json_loads(next_data_raw) if next_data_raw else None
+
+        # Every field comes from the decoded JSON, so the loader doesn't need the response
+        loader = BookLoader(BookItem())
+        loader.add_value("description", next_data)
+        loader.add_value("genres", next_data)
+        loader.add_value("publishedYear", next_data)
         item = loader.load_item()
+        goodreads_url = response.url
+
+        # Drop the raw and decoded __NEXT_DATA__ before the result goes through the
+        # pipelines; Scrapy keeps the response itself referenced until the callback ends
+        del next_data_raw, next_data
 
         description = item.get("description", "") or ""
         genres = item.get("genres", []) or []
@@ -94,11 +117,12 @@ class SearchSpider(scrapy.Spider):
         )
         yield SearchResultItem(
             row_idx=row_idx,
+            duplicate_row_idxs=duplicate_row_idxs,
             title=title,
             author=author or "",
             description=description,
             genres=";".join(genres) if isinstance(genres, list) else str(genres),
             publishedYear=published_year,
-            goodreads_url=response.url,
+            goodreads_url=goodreads_url,
             status="found",
         )
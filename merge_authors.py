@@ -8,8 +8,10 @@ app = marimo.App(width="medium")
 def _():
     import marimo as mo
     import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-    return mo, pd
+    return mo, pa, pc, pd
 
 
 @app.cell
@@ -35,22 +37,38 @@ def _(pd):
 
 
 @app.cell
-def _(author_lookup, books):
+def _(author_lookup, books, pa, pc, pd):
     # Each cell in `authors` is a list of dicts like [{'author_id': '604031', 'role': ''}].
     # Take only the first (primary) author per book.
-    # authors column is decoded as a numpy array of dicts by pandas
-    primary_author_id = books["authors"].apply(
-        lambda lst: lst[0]["author_id"] if len(lst) > 0 else None
+    # Convert to an Arrow list<struct> column so the lookup runs in Arrow's C kernels
+    # instead of a per-row Python lambda; empty lists come back as nulls.
+    authors_arr = pa.array(books["authors"])
+    first_idx = pc.if_else(
+        pc.greater(pc.list_value_length(authors_arr), 0),
+        authors_arr.offsets[:-1],
+        pa.scalar(None, authors_arr.offsets.type),
     )
-
-    # Build a simple id -> name map from the authors parquet.
-    # author_id may be int or string depending on the parquet — normalise to str.
-    id_to_name = author_lookup.set_index(
-        author_lookup["author_id"].astype(str)
-    )["name"]
-
-    books_with_author = books.copy()
-    books_with_author["author_name"] = primary_author_id.astype(str).map(id_to_name)
+    first_author = authors_arr.values.take(first_idx)
+    # author_id may be int or string depending on the parquet; cast to string so it
+    # always joins against the string ids on the lookup side below
+    primary_author_id = pc.cast(pc.struct_field(first_author, "author_id"), pa.string()).to_pandas()
+    primary_author_id.index = books.index
+
+    # Build a simple id -> name table from the authors parquet, with string ids to
+    # match the ones extracted above.
+    id_to_name = pd.DataFrame({
+        "_primary_author_id": author_lookup["author_id"].astype(str),
+        "author_name": author_lookup["name"],
+    }).drop_duplicates("_primary_author_id")
+
+    # Join only the id column against the lookup (a left hash-join keeps every book
+    # and its order; unmatched ids get NaN), then attach the names to `books` in place.
+    # Copying/merging the full books frame would double peak memory for one column.
+    author_name = pd.DataFrame({"_primary_author_id": primary_author_id}).merge(
+        id_to_name, on="_primary_author_id", how="left"
+    )["author_name"]
+    books["author_name"] = author_name.to_numpy()
+    books_with_author = books
 
     missing = books_with_author["author_name"].isna().sum()
     print(f"Rows with author name resolved: {len(books_with_author) - missing:,}")
@@ -74,7 +92,18 @@ def _(missing, mo):
 @app.cell
 def _(books_with_author):
     output_path = "3_goodreads_books_with_metrics_author_name.parquet"
-    books_with_author.to_parquet(output_path, index=False)
+    # zstd keeps the file small; 128K-row groups are small enough that downstream
+    # readers can skip most of the file for partial scans using the column statistics
+    books_with_author.to_parquet(
+        output_path,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        row_group_size=131072,
+        use_dictionary=True,
+        write_statistics=True,
+    )
     print(f"Saved → {output_path}  ({len(books_with_author):,} rows)")
     return
 
@@ -1,23 +1,37 @@
 """High-throughput Goodreads book search scraper.
 
 Reads a parquet dataset of books, searches each on Goodreads, and extracts
-descriptions and genres. Uses multiprocessing with Scrapy for throughput.
+descriptions and genres. A single Scrapy process keeps a few hundred requests
+in flight, which is usually enough to saturate the per-domain limit; extra
+worker processes are only worth it when page parsing becomes CPU-bound.
 
 Usage:
-    python search_crawl.py --input books.parquet --output results.csv --workers 10
-    python search_crawl.py --input books.parquet --output results.csv --workers 10 --resume
-    python search_crawl.py --input books.parquet --output results.csv --workers 10 --debug
+    python search_crawl.py --input books.parquet --output results.csv
+    python search_crawl.py --input books.parquet --output results.csv --resume
+    python search_crawl.py --input books.parquet --output results.csv --debug
+    python search_crawl.py --input books.parquet --output results.csv --workers 4
 """
 
 import argparse
 import csv
+import gc
+import importlib.util
+import io
+import mmap
 import multiprocessing
+import multiprocessing.connection
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import pyarrow.parquet as pq
 from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn, TimeElapsedColumn
 
+from GoodreadsScraper.search_urls import build_search_url
+
 
 def clean_directories(checkpoint_dir, log_dir, output_file):
     """Delete and recreate checkpoint/log dirs; remove previous output CSV."""
@@ -30,27 +44,52 @@ def clean_directories(checkpoint_dir, log_dir, output_file):
 
 
 def load_checkpoint(checkpoint_dir):
-    """Load all completed row indices from checkpoint files."""
-    completed = set()
-    if not os.path.isdir(checkpoint_dir):
-        return completed
-    for fname in os.listdir(checkpoint_dir):
-        if fname.startswith("checkpoint_") and fname.endswith(".txt"):
-            path = os.path.join(checkpoint_dir, fname)
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        completed.add(int(line))
-    return completed
-
-
-def read_books_from_parquet(parquet_path):
-    """Read books from parquet, returning list of (row_idx, title, author_or_None)."""
-    table = pq.read_table(parquet_path)
-    columns = table.column_names
-
-    titles = table.column("title").to_pylist()
+    """Load all completed row indices from checkpoint files as a unique int64 Arrow array.
+
+    The files are parsed with Arrow's CSV reader rather than int() per line.
+    """
+    arrays = []
+    if os.path.isdir(checkpoint_dir):
+        with os.scandir(checkpoint_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("checkpoint_") and entry.name.endswith(".txt")):
+                    continue
+                if not entry.is_file(follow_symlinks=False) or entry.stat().st_size == 0:
+                    continue
+                table = pa_csv.read_csv(
+                    entry.path,
+                    read_options=pa_csv.ReadOptions(column_names=["row_idx"]),
+                    convert_options=pa_csv.ConvertOptions(column_types={"row_idx": pa.int64()}),
+                )
+                arrays.extend(table.column("row_idx").chunks)
+    if not arrays:
+        return pa.array([], type=pa.int64())
+    return pc.unique(pa.concat_arrays(arrays))
+
+
+def find_worker_csv_files(checkpoint_dir):
+    """Return {worker_id: path} for every worker_<id>.csv in the checkpoint directory."""
+    found = {}
+    if os.path.isdir(checkpoint_dir):
+        with os.scandir(checkpoint_dir) as entries:
+            for entry in entries:
+                worker_id = entry.name[len("worker_"):-len(".csv")]
+                if not (entry.name.startswith("worker_") and entry.name.endswith(".csv") and worker_id.isdigit()):
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    found[int(worker_id)] = entry.path
+    return found
+
+
+def read_books_from_parquet(parquet_path, skip=None, batch_size=65536):
+    """Yield (row_idx, title, author_or_None) from parquet, one record batch at a time.
+
+    Only the title/author columns are read, and only one batch is materialized
+    as Python objects at once, instead of the whole table. Rows whose index is
+    in the Arrow array `skip` (e.g. from load_checkpoint) are dropped.
+    """
+    pf = pq.ParquetFile(parquet_path)
+    columns = pf.schema_arrow.names
 
     # Try common author column names
     author_col = None
@@ -59,24 +98,97 @@ def read_books_from_parquet(parquet_path):
             author_col = candidate
             break
 
-    if author_col:
-        authors = table.column(author_col).to_pylist()
-    else:
-        authors = [None] * len(titles)
-
-    books = []
-    for i, (title, author) in enumerate(zip(titles, authors)):
-        if title:
-            # Handle list-type author fields
-            if isinstance(author, list):
-                author = author[0] if author else None
-            books.append((i, str(title), str(author) if author else None))
-
-    return books
-
-
-def run_worker(worker_id, books, output_file, checkpoint_file, debug=False):
-    """Run a Scrapy crawler in a separate process."""
+    read_columns = ["title"] + ([author_col] if author_col else [])
+
+    row_offset = 0
+    for batch in pf.iter_batches(batch_size=batch_size, columns=read_columns):
+        titles = batch.column(batch.schema.get_field_index("title"))
+        if not pa.types.is_string(titles.type):
+            titles = pc.cast(titles, pa.string())
+
+        # Keep rows with a non-null, non-empty title
+        keep = pc.fill_null(pc.greater(pc.utf8_length(titles), 0), False)
+        row_idxs = pc.add(pc.cast(pc.indices_nonzero(keep), pa.int64()), row_offset)
+        titles = titles.filter(keep)
+
+        if author_col:
+            authors = batch.column(batch.schema.get_field_index(author_col))
+            # Handle list-type author fields by taking the first element (null when empty)
+            if pa.types.is_list(authors.type) or pa.types.is_large_list(authors.type):
+                first_idx = pc.if_else(
+                    pc.greater(pc.list_value_length(authors), 0),
+                    authors.offsets[:-1],
+                    pa.scalar(None, authors.offsets.type),
+                )
+                authors = authors.values.take(first_idx)
+            authors = authors.filter(keep)
+        else:
+            authors = pa.nulls(len(titles))
+
+        if skip is not None and len(skip):
+            fresh = pc.invert(pc.is_in(row_idxs, value_set=skip))
+            row_idxs, titles, authors = row_idxs.filter(fresh), titles.filter(fresh), authors.filter(fresh)
+
+        row_idxs, titles, authors = row_idxs.to_pylist(), titles.to_pylist(), authors.to_pylist()
+
+        for i, title, author in zip(row_idxs, titles, authors):
+            yield (i, title, str(author) if author else None)
+
+        row_offset += batch.num_rows
+
+
+def dedupe_books(books):
+    """Collapse books with the same title/author (case- and whitespace-insensitive).
+
+    Returns (row_idx, title, author, duplicate_row_idxs) tuples, where the first
+    row of each group is searched and the rest ride along so they get
+    checkpointed with it.
+    """
+    groups = {}
+    for book in books:
+        row_idx, title, author = book
+        key = (title.strip().lower(), (author or "").strip().lower())
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [book]
+        else:
+            group.append(row_idx)
+    return [(*group[0], tuple(group[1:])) for group in groups.values()]
+
+
+def with_search_urls(books):
+    """Insert the Goodreads search URL after (row_idx, title, author) in each tuple."""
+    return [
+        (i, title, author, build_search_url(title, author), *rest)
+        for i, title, author, *rest in books
+    ]
+
+
+def worker_for_row(row_idx, num_workers):
+    """Deterministically assign a row to a worker (Fibonacci hash + multiply-shift).
+
+    Unlike round-robin over the remaining books, a row keeps its worker (and so
+    its worker CSV/checkpoint) across resumed runs with the same worker count.
+    """
+    return (((row_idx * 2654435761) & 0xFFFFFFFF) * num_workers) >> 32
+
+
+# Requests in flight across all workers; Goodreads is a single domain, so this
+# is split between workers rather than multiplied by them
+TOTAL_CONCURRENT_REQUESTS = 200
+
+# Scrapy's HTTP/2 handler needs the optional h2 package; without it workers fall
+# back to pooled HTTP/1.1 connections (up to CONCURRENT_REQUESTS_PER_DOMAIN)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def run_worker(worker_id, books, output_file, checkpoint_file, progress_counter, debug=False, concurrent_requests=TOTAL_CONCURRENT_REQUESTS):
+    """Run a Scrapy crawler in a separate process.
+
+    `progress_counter` is a shared multiprocessing.Value that the CSV pipeline
+    bumps once per written book, so the parent can track progress without
+    touching the checkpoint files.
+    """
     # Import here to avoid Twisted reactor issues
     from scrapy.crawler import CrawlerProcess
 
@@ -84,8 +196,10 @@ def run_worker(worker_id, books, output_file, checkpoint_file, debug=False):
         "BOT_NAME": "GoodreadsScraper",
         "SPIDER_MODULES": ["GoodreadsScraper.spiders"],
         "NEWSPIDER_MODULE": "GoodreadsScraper.spiders",
-        "CONCURRENT_REQUESTS": 32,
-        "CONCURRENT_REQUESTS_PER_DOMAIN": 32,
+        "CONCURRENT_REQUESTS": concurrent_requests,
+        "CONCURRENT_REQUESTS_PER_DOMAIN": concurrent_requests,
+        "REACTOR_THREADPOOL_MAXSIZE": 20,
+        "DNS_TIMEOUT": 10,
         "DOWNLOAD_DELAY": 0,
         "ROBOTSTXT_OBEY": False,
         "RETRY_TIMES": 2,
@@ -95,12 +209,24 @@ def run_worker(worker_id, books, output_file, checkpoint_file, debug=False):
         },
         "SEARCH_OUTPUT_FILE": output_file,
         "SEARCH_CHECKPOINT_FILE": checkpoint_file,
+        # Rows are buffered and written with one writerows() + flush per batch
+        "SEARCH_WRITE_BATCH": 256,
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
         "TELNETCONSOLE_ENABLED": False,
         "REDIRECT_ENABLED": True,
         "RETRY_HTTP_CODES": [500, 502, 503, 504, 522, 524, 408, 429, 403],
         "HTTPERROR_ALLOWED_CODES": [301, 302, 303, 307, 308, 403, 404, 429],
-        "COOKIES_ENABLED": True,
+        # Searches and book pages need no session state; skipping the cookie
+        # jar saves work on every response
+        "COOKIES_ENABLED": False,
+        "SCHEDULER_PRIORITY_QUEUE": "scrapy.pqueues.DownloaderAwarePriorityQueue",
+        # Every request goes to goodreads.com, so a small cache is plenty; the
+        # hostname resolver also handles IPv6 and is what the asyncio reactor
+        # is meant to be paired with
+        "DNSCACHE_ENABLED": True,
+        "DNSCACHE_SIZE": 1024,
+        "DNS_RESOLVER": "scrapy.resolver.CachingHostnameResolver",
+        "TWISTED_REACTOR": "twisted.internet.asyncioreactor.AsyncioSelectorReactor",
         "DEFAULT_REQUEST_HEADERS": {
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
@@ -123,6 +249,9 @@ def run_worker(worker_id, books, output_file, checkpoint_file, debug=False):
             "DEBUG_ENABLED": True,
             "DEBUG_DUMP_DIR": os.path.join("logs", f"debug_responses_worker_{worker_id}"),
             "DEBUG_MAX_SNIPPET": 600,
+            # Dump every error page but only 1% of successful ones
+            "DEBUG_SAMPLE_RATE": 0.01,
+            "DEBUG_DUMP_ONLY_ERRORS": False,
         })
     else:
         # Quiet mode: only WARNING+ goes to a log file; console stays clean
@@ -132,33 +261,144 @@ def run_worker(worker_id, books, output_file, checkpoint_file, debug=False):
             "DEBUG_ENABLED": False,
         })
 
+    # HTTP/2 multiplexes every search/book request over one connection per worker,
+    # so there's a single TLS handshake instead of one per pooled connection
+    if HTTP2_AVAILABLE:
+        settings["DOWNLOAD_HANDLERS"] = {
+            "https": "scrapy.core.downloader.handlers.http2.H2DownloadHandler",
+        }
+
     process = CrawlerProcess(settings)
-    process.crawl("search", books=books)
+    process.crawl("search", books=books, progress_counter=progress_counter)
     process.start()
 
 
 CSV_COLUMNS = ["title", "author", "genres", "description", "publishedYear", "goodreads_url", "status"]
 
 
+def _read_and_normalize_csv(worker_file):
+    """Return a worker CSV's rows (without header) re-ordered to CSV_COLUMNS, as CSV text."""
+    if not os.path.exists(worker_file):
+        return ""
+    buf = io.StringIO(newline="")
+    with open(worker_file, "r", newline="", encoding="utf-8") as inf:
+        reader = csv.reader(inf)
+        header = next(reader, None)
+        if header is None:
+            return ""
+        # Map output columns to this file's positions once, not per row
+        perm = [header.index(col) if col in header else -1 for col in CSV_COLUMNS]
+        csv.writer(buf).writerows(
+            ["" if i < 0 or i >= len(row) else row[i] for i in perm]
+            for row in reader
+        )
+    return buf.getvalue()
+
+
+def _csv_header_bytes(columns):
+    buf = io.StringIO(newline="")
+    csv.writer(buf).writerow(columns)
+    return buf.getvalue().encode("utf-8")
+
+
+# The exact header line CsvSearchResultPipeline writes when its columns match ours
+CSV_HEADER = _csv_header_bytes(CSV_COLUMNS)
+
+
+def _ends_on_record_boundary(buf, chunk=1 << 24):
+    """True if `buf` ends with a newline that isn't inside a quoted field.
+
+    As in _complete_records_end, that means the file holds an even number of
+    quote characters; they're counted in chunks so an mmap is never copied whole.
+    """
+    if buf[-1:] != b"\n":
+        return False
+    quotes = sum(buf[i:i + chunk].count(b'"') for i in range(0, len(buf), chunk))
+    return quotes % 2 == 0
+
+
+def _is_canonical_csv(worker_file):
+    """True if a worker file has the CSV_COLUMNS header and ends on a complete record."""
+    with open(worker_file, "rb") as inf, mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[:len(CSV_HEADER)] == CSV_HEADER and _ends_on_record_boundary(mm)
+
+
 def merge_csv_files(worker_files, final_output):
-    """Merge per-worker CSV files into a single output CSV."""
-    with open(final_output, "w", newline="", encoding="utf-8") as outf:
-        writer = csv.DictWriter(outf, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-        for wf in worker_files:
-            if not os.path.exists(wf):
-                continue
-            with open(wf, "r", encoding="utf-8") as inf:
-                reader = csv.DictReader(inf)
-                for row in reader:
-                    writer.writerow({col: row.get(col, "") for col in CSV_COLUMNS})
+    """Merge per-worker CSV files into a single output CSV.
+
+    A complete worker file whose header is already CSV_COLUMNS is copied past its
+    header byte-for-byte through mmap. Any other file, including one a killed
+    worker left cut off mid-row or mid-field, is parsed and re-ordered; those are
+    normalized concurrently while the rest are copied, then written out in order.
+    """
+    worker_files = [wf for wf in worker_files if os.path.exists(wf) and os.path.getsize(wf) > 0]
+    with ThreadPoolExecutor(max_workers=max(1, min(len(worker_files), 8))) as ex:
+        pending = {
+            wf: ex.submit(_read_and_normalize_csv, wf)
+            for wf in worker_files
+            if not _is_canonical_csv(wf)
+        }
+        with open(final_output, "wb") as outf:
+            outf.write(CSV_HEADER)
+            for wf in worker_files:
+                if wf in pending:
+                    outf.write(pending[wf].result().encode("utf-8"))
+                    continue
+                with open(wf, "rb") as inf, mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        outf.write(view[len(CSV_HEADER):])
+
+
+def _complete_records_end(data):
+    """Return the length of the complete CSV records at the start of `data`.
+
+    `data` must start on a record boundary. A newline only ends a record when it
+    falls outside a quoted field, i.e. after an even number of quote characters
+    (escaped quotes come in pairs), so descriptions with embedded newlines are
+    never split.
+    """
+    end = len(data)
+    quotes = data.count(b'"')
+    while True:
+        nl = data.rfind(b"\n", 0, end)
+        if nl < 0:
+            return 0
+        quotes -= data.count(b'"', nl, end)
+        if quotes % 2 == 0:
+            return nl + 1
+        end = nl
+
+
+def append_new_csv_rows(worker_files, offsets, outf):
+    """Append rows written to each worker CSV since the last call to the binary file `outf`.
+
+    Workers write CSV_COLUMNS in canonical order, so rows are copied as raw bytes
+    (past each worker's header) instead of being re-parsed. `offsets` holds one
+    byte offset per worker file and is updated in place.
+    """
+    for i, wf in enumerate(worker_files):
+        if not os.path.exists(wf):
+            continue
+        with open(wf, "rb") as inf:
+            if offsets[i] == 0:
+                header = inf.readline()
+                if not header.endswith(b"\n"):
+                    continue
+                offsets[i] = len(header)
+            inf.seek(offsets[i])
+            new = inf.read()
+        # Leave a row the worker is still writing (or that its file buffer only
+        # partly flushed) for the next call
+        end = _complete_records_end(new)
+        outf.write(memoryview(new)[:end])
+        offsets[i] += end
 
 
 def main():
     parser = argparse.ArgumentParser(description="Search Goodreads for book descriptions and genres.")
     parser.add_argument("--input", required=True, help="Input parquet file path")
     parser.add_argument("--output", default="search_results.csv", help="Output CSV file path")
-    parser.add_argument("--workers", type=int, default=10, help="Number of worker processes")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoints (skips clean)")
     parser.add_argument("--debug", action="store_true", help="Verbose logging + HTML response dumps")
     args = parser.parse_args()
@@ -174,48 +414,86 @@ def main():
         clean_directories(CHECKPOINT_DIR, LOG_DIR, args.output)
 
     print(f"Reading parquet: {args.input}")
-    books = read_books_from_parquet(args.input)
-    print(f"Total books in parquet: {len(books):,}")
+    completed = load_checkpoint(CHECKPOINT_DIR) if args.resume else None
+
+    # Completed rows are dropped while streaming, so they're never held in memory
+    books = dedupe_books(read_books_from_parquet(args.input, skip=completed))
+    num_rows = len(books) + sum(len(b[3]) for b in books)
 
     if args.resume:
-        completed = load_checkpoint(CHECKPOINT_DIR)
+        print(f"Total books in parquet: {num_rows + len(completed):,}")
         print(f"Already completed: {len(completed):,} books")
-        books = [(idx, t, a) for idx, t, a in books if idx not in completed]
-        print(f"Remaining: {len(books):,} books")
+        print(f"Remaining: {num_rows:,} books")
+    else:
+        print(f"Total books in parquet: {num_rows:,}")
+    if num_rows > len(books):
+        print(f"Duplicate title/author rows: {num_rows - len(books):,} (searched once per group)")
+
+    # Search URLs are built once here rather than in each worker's start_requests
+    books = with_search_urls(books)
 
     if not books:
         print("No books to process.")
         return
 
-    num_workers = min(args.workers, len(books))
+    # Shard on the requested worker count rather than the number of books left, so a
+    # row keeps its worker CSV/checkpoint at the tail of a resumed run; only workers
+    # that got books are started
+    num_workers = args.workers
     partitions = [[] for _ in range(num_workers)]
-    for i, book in enumerate(books):
-        partitions[i % num_workers].append(book)
-
-    worker_csv_files = []
+    for book in books:
+        partitions[worker_for_row(book[0], num_workers)].append(book)
+    worker_ids = [i for i, partition in enumerate(partitions) if partition]
+
+    concurrent_requests = max(TOTAL_CONCURRENT_REQUESTS // len(worker_ids), 16)
+
+    # Per-worker paths are built once and reused by the launch, snapshot and merge steps
+    worker_csv_files = [os.path.join(CHECKPOINT_DIR, f"worker_{i}.csv") for i in range(num_workers)]
+    checkpoint_files = [os.path.join(CHECKPOINT_DIR, f"checkpoint_{i}.txt") for i in range(num_workers)]
+    snapshot_path_fmt = os.path.join(CHECKPOINT_DIR, "snapshot_{}pct.csv").format
+    # A resumed run may use fewer workers than the one that wrote the checkpoints;
+    # every worker CSV already on disk still belongs in snapshots and the merge
+    output_csv_files = dict(enumerate(worker_csv_files))
+    if args.resume:
+        output_csv_files.update(find_worker_csv_files(CHECKPOINT_DIR))
+    output_csv_files = [output_csv_files[i] for i in sorted(output_csv_files)]
+    # Workers are forked from a small server process that has only imported Scrapy,
+    # instead of from this one with the whole book list and Arrow buffers in memory
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["scrapy", "scrapy.crawler"])
+    # One counter per worker, so each has a single writer and needs no lock
+    progress_counters = [ctx.Value("Q", 0, lock=False) for _ in worker_ids]
     processes = []
 
     print(
-        f"Launching {num_workers} worker(s)  |  "
+        f"Launching {len(worker_ids)} worker(s)  |  "
         f"debug={'on' if args.debug else 'off'}  |  "
-        f"{len(books):,} books total"
+        f"http2={'on' if HTTP2_AVAILABLE else 'off (pip install h2)'}  |  "
+        f"{len(books):,} unique books total"
     )
 
-    for worker_id in range(num_workers):
-        output_file = os.path.join(CHECKPOINT_DIR, f"worker_{worker_id}.csv")
-        checkpoint_file = os.path.join(CHECKPOINT_DIR, f"checkpoint_{worker_id}.txt")
-        worker_csv_files.append(output_file)
-
-        p = multiprocessing.Process(
+    for worker_id, progress_counter in zip(worker_ids, progress_counters):
+        p = ctx.Process(
             target=run_worker,
-            args=(worker_id, partitions[worker_id], output_file, checkpoint_file),
-            kwargs={"debug": args.debug},
+            args=(
+                worker_id,
+                partitions[worker_id],
+                worker_csv_files[worker_id],
+                checkpoint_files[worker_id],
+                progress_counter,
+            ),
+            kwargs={"debug": args.debug, "concurrent_requests": concurrent_requests},
         )
         processes.append(p)
         p.start()
 
+    # Each worker has its own pickled copy of its partition now
     total_books = len(books)
+    del books, partitions
+    gc.collect()
     next_snapshot_pct = 10
+    snapshot_offsets = [0] * len(output_csv_files)
+    prev_snapshot_file = None
 
     with Progress(
         "[progress.description]{task.description}",
@@ -227,19 +505,15 @@ def main():
         TextColumn("{task.completed}/{task.total} books"),
     ) as progress:
         task = progress.add_task(
-            f"[cyan]Searching Goodreads...  [white]{num_workers} workers / 0 failed",
+            f"[cyan]Searching Goodreads...  [white]{len(worker_ids)} workers / 0 failed",
             total=total_books,
         )
 
-        while any(p.is_alive() for p in processes):
-            completed_count = 0
-            for worker_id in range(num_workers):
-                cp_file = os.path.join(CHECKPOINT_DIR, f"checkpoint_{worker_id}.txt")
-                if os.path.exists(cp_file):
-                    with open(cp_file) as f:
-                        completed_count += sum(1 for line in f if line.strip())
+        alive = list(processes)
+        while alive:
+            completed_count = sum(c.value for c in progress_counters)
 
-            active = sum(1 for p in processes if p.is_alive())
+            active = len(alive)
             failed = sum(1 for p in processes if not p.is_alive() and p.exitcode != 0)
 
             progress.update(
@@ -255,36 +529,38 @@ def main():
             if total_books > 0:
                 pct_done = (completed_count / total_books) * 100
                 if pct_done >= next_snapshot_pct:
-                    snapshot_file = os.path.join(CHECKPOINT_DIR, f"snapshot_{next_snapshot_pct}pct.csv")
-                    merge_csv_files(worker_csv_files, snapshot_file)
+                    snapshot_file = snapshot_path_fmt(next_snapshot_pct)
+                    # Each snapshot extends the previous one with only the rows written since
+                    if prev_snapshot_file:
+                        shutil.copyfile(prev_snapshot_file, snapshot_file)
+                    else:
+                        with open(snapshot_file, "w", newline="", encoding="utf-8") as outf:
+                            csv.writer(outf).writerow(CSV_COLUMNS)
+                    with open(snapshot_file, "ab") as outf:
+                        append_new_csv_rows(output_csv_files, snapshot_offsets, outf)
+                    prev_snapshot_file = snapshot_file
                     progress.console.print(f"[green]Saved data snapshot: {snapshot_file}")
                     next_snapshot_pct += 10
 
-            for p in processes:
-                p.join(timeout=2)
-                if not any(p.is_alive() for p in processes):
-                    break
-
-        # Final checkpoint count
-        completed_count = 0
-        for worker_id in range(num_workers):
-            cp_file = os.path.join(CHECKPOINT_DIR, f"checkpoint_{worker_id}.txt")
-            if os.path.exists(cp_file):
-                with open(cp_file) as f:
-                    completed_count += sum(1 for line in f if line.strip())
+            # Wake up as soon as a worker exits; otherwise refresh progress twice a second
+            multiprocessing.connection.wait([p.sentinel for p in alive], timeout=0.5)
+            alive = [p for p in alive if p.is_alive()]
+
+        # Final count
+        completed_count = sum(c.value for c in progress_counters)
         progress.update(task, completed=completed_count)
 
     # Report any failures
-    failed_workers = [(i, p.exitcode) for i, p in enumerate(processes) if p.exitcode != 0]
+    failed_workers = [(i, p.exitcode) for i, p in zip(worker_ids, processes) if p.exitcode != 0]
     if failed_workers:
         for i, code in failed_workers:
             log_hint = f"  → check logs/worker_{i}.log" if not args.debug else ""
             print(f"[warn] Worker {i} exited with code {code}{log_hint}")
     else:
-        print(f"All {num_workers} workers finished successfully.")
+        print(f"All {len(worker_ids)} workers finished successfully.")
 
     print(f"Merging results into {args.output}...")
-    merge_csv_files(worker_csv_files, args.output)
+    merge_csv_files(output_csv_files, args.output)
 
     if os.path.exists(args.output):
         with open(args.output) as f: